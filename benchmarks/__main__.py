@@ -0,0 +1,50 @@
+"""Run the TimeDelta benchmark suite.
+
+Usage::
+
+    python -m benchmarks                          # print results
+    python -m benchmarks --save baseline.json     # store a baseline
+    python -m benchmarks --compare baseline.json  # fail on regression
+
+Baselines are machine specific, so compare only against baselines saved on
+the same machine.
+"""
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import sys
+
+from .runner import compare, load, run, save
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--save', metavar='PATH', help='Save results as JSON baseline.')
+    parser.add_argument('--compare', metavar='PATH', help='Compare results against JSON baseline.')
+    parser.add_argument(
+        '--threshold', type=float, default=0.25,
+        help='Allowed fractional increase before a metric counts as a '
+             'regression (default: %(default)s).')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repeats (default: %(default)s).')
+    parser.add_argument('-k', dest='pattern', help='Only run metrics containing this substring.')
+    args = parser.parse_args(argv)
+
+    results = run(repeat=args.repeat, pattern=args.pattern)
+    for name, metric in results.items():
+        print('{:<40} {:>12.3f} {}'.format(name, metric['value'], metric['unit']))
+
+    if args.save:
+        save(args.save, results)
+
+    if args.compare:
+        regressions = compare(load(args.compare), results, args.threshold)
+        for name, old, new in regressions:
+            print('REGRESSION {}: {:.3f} -> {:.3f} ({:+.1%})'.format(
+                name, old, new, new / old - 1), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
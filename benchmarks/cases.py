@@ -0,0 +1,132 @@
+# coding: utf-8
+"""Benchmark cases covering TimeDelta hot paths.
+
+Each case is a zero-argument callable performing one operation. Timings are
+reported per call.
+"""
+from __future__ import absolute_import, division, print_function
+
+import io
+import operator
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+from bettertimedelta import TimeDelta, shift_datetimes
+from bettertimedelta.csvio import read_columns, write_columns
+
+td1 = TimeDelta(weeks=1, days=2, hours=3, minutes=4, seconds=5, milliseconds=6, microseconds=7)
+td2 = TimeDelta(days=3, seconds=30)
+std = timedelta(days=3, seconds=30)
+dt = datetime(2016, 1, 1)
+datetimes = [datetime(2016, 1, 1, second=i % 60) for i in range(1000)]
+
+_comparisons = ['lt', 'le', 'eq', 'ne', 'gt', 'ge']
+_arithmetic = ['add', 'sub', 'mod', 'truediv']
+
+
+def _parse(string):
+    # TimeDelta.parse prints debugging output, which shouldn't be timed
+    # against the terminal.
+    with redirect_stdout(io.StringIO()):
+        return TimeDelta.parse(string)
+
+
+def _binary(func, left, right):
+    return lambda: func(left, right)
+
+
+def construction_cases():
+    return OrderedDict([
+        ('construct.int', lambda: TimeDelta(seconds=1)),
+        ('construct.int_all', lambda: TimeDelta(1, 2, 3, 4, 5, 6, 7)),
+        ('construct.float', lambda: TimeDelta(seconds=0.1)),
+        ('construct.negative_int', lambda: TimeDelta(seconds=-1)),
+        ('construct.negative_float', lambda: TimeDelta(seconds=-1.5)),
+        ('construct.huge_weeks', lambda: TimeDelta(weeks=10 ** 30)),
+        ('construct.huge_negative_weeks', lambda: TimeDelta(weeks=-10 ** 30, microseconds=0.5)),
+        ('construct.from_seconds_float', lambda: TimeDelta.from_seconds(0.1)),
+        ('construct.from_nanoseconds', lambda: TimeDelta.from_nanoseconds(123456789)),
+        ('construct.from_timedelta', lambda: TimeDelta.from_timedelta(std)),
+    ])
+
+
+def operator_cases():
+    cases = OrderedDict()
+    for name in _comparisons + _arithmetic:
+        func = getattr(operator, name)
+        cases['op.{}.TimeDelta'.format(name)] = _binary(func, td1, td2)
+        cases['op.{}.timedelta'.format(name)] = _binary(func, td1, std)
+    cases['op.floordiv.TimeDelta'] = _binary(operator.floordiv, td1, td2)
+    cases['op.radd.timedelta'] = _binary(operator.add, std, td1)
+    cases['op.rsub.timedelta'] = _binary(operator.sub, std, td1)
+    cases['op.add.datetime'] = _binary(operator.add, td1, dt)
+    cases['op.radd.datetime'] = _binary(operator.add, dt, td1)
+    cases['op.rsub.datetime'] = _binary(operator.sub, dt, td1)
+    cases['op.mul.int'] = _binary(operator.mul, td1, 3)
+    cases['op.mul.float'] = _binary(operator.mul, td1, 0.5)
+    cases['op.rmul.int'] = _binary(operator.mul, 3, td1)
+    cases['op.truediv.int'] = _binary(operator.truediv, td1, 3)
+    cases['op.floordiv.int'] = _binary(operator.floordiv, td1, 3)
+    cases['op.divmod.TimeDelta'] = _binary(divmod, td1, td2)
+    cases['bulk.shift_datetimes_1000'] = lambda: shift_datetimes(datetimes, td1)
+    cases['op.neg'] = lambda: -td1
+    cases['op.abs'] = lambda: abs(td1)
+    cases['op.bool'] = lambda: bool(td1)
+    return cases
+
+
+def formatting_cases():
+    return OrderedDict([
+        ('format.spec', lambda: '{:%w %d %H:%M:%S.%mS%uS}'.format(td1)),
+        ('format.str', lambda: str(td1)),
+        ('format.repr', lambda: repr(td1)),
+        ('format.method', lambda: td1.format()),
+        ('format.method_hide_zeros', lambda: td2.format(hide_zeros=True)),
+        ('format.method_symbols', lambda: td1.format(symbols=True)),
+        ('parse', lambda: _parse('1 week 2 days 3 h 4 min 5.5 s')),
+        ('as_dict', lambda: td1.as_dict()),
+        ('as_timedelta', lambda: td1.as_timedelta()),
+    ])
+
+
+_csv_rows = [[i, TimeDelta(seconds=i), i * 1000] for i in range(1000)]
+
+
+def _write_csv(fmt):
+    f = io.StringIO(newline='')
+    write_columns(f, _csv_rows, [1, 2], formats=fmt)
+    return f
+
+
+def _read_csv(f, fmt):
+    f.seek(0)
+    for chunk in read_columns(f, [1, 2], formats=fmt, header=False):
+        pass
+
+
+def csv_cases():
+    cases = OrderedDict()
+    for fmt in ['str', 'symbols', 'microseconds']:
+        f = _write_csv(fmt)
+        cases['csv.write_1000.' + fmt] = lambda fmt=fmt: _write_csv(fmt)
+        cases['csv.read_1000.' + fmt] = lambda f=f, fmt=fmt: _read_csv(f, fmt)
+    return cases
+
+
+def timing_cases():
+    cases = OrderedDict()
+    cases.update(construction_cases())
+    cases.update(operator_cases())
+    cases.update(formatting_cases())
+    cases.update(csv_cases())
+    return cases
+
+
+def memory_cases():
+    """Return callables creating one instance, for measuring memory."""
+    return OrderedDict([
+        ('memory.small', lambda: TimeDelta(seconds=1)),
+        ('memory.full', lambda: TimeDelta(1, 2, 3, 4, 5, 6, 7)),
+        ('memory.huge_weeks', lambda: TimeDelta(weeks=10 ** 30)),
+    ])
@@ -0,0 +1,46 @@
+"""Measure import time with python -X importtime."""
+from __future__ import absolute_import, division, print_function
+
+import os
+import re
+import subprocess
+import sys
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#: Whether this interpreter supports python -X importtime.
+SUPPORTED = sys.version_info >= (3, 7)
+
+
+def import_time(module='bettertimedelta', repeat=5):
+    """Return best cumulative import time of module in microseconds.
+
+    Each measurement uses a fresh interpreter, so modules imported by
+    `module` are included in the total. Raises RuntimeError if the
+    interpreter doesn't support -X importtime.
+    """
+    pattern = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ' + re.escape(module) + '$')
+    times = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+            stderr=subprocess.STDOUT, cwd=_root, universal_newlines=True)
+        for line in output.splitlines():
+            match = pattern.match(line)
+            if match:
+                times.append(int(match.group(1)))
+    if not times:
+        raise RuntimeError(
+            'No import time reported for {!r}. python -X importtime '
+            'requires Python 3.7+.'.format(module))
+    return min(times)
+
+
+def imported_modules(module='bettertimedelta'):
+    """Return names of modules newly imported by importing module."""
+    code = (
+        'import sys; before = set(sys.modules); import {}; '
+        'print("\\n".join(sorted(set(sys.modules) - before)))'.format(module))
+    output = subprocess.check_output(
+        [sys.executable, '-c', code], cwd=_root, universal_newlines=True)
+    return set(output.split())
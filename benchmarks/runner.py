@@ -0,0 +1,83 @@
+"""Timing, memory measurement and baseline comparison."""
+from __future__ import absolute_import, division, print_function
+
+import gc
+import json
+import timeit
+import tracemalloc
+from collections import OrderedDict
+
+from . import cases
+from . import importtime
+
+
+def time_per_call(func, repeat=5, min_time=0.05):
+    """Return best time per call in nanoseconds."""
+    timer = timeit.Timer(func)
+    number, elapsed = 1, 0
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 10
+    best = min([elapsed] + timer.repeat(repeat - 1, number))
+    return best / number * 1e9
+
+
+def memory_per_instance(func, count=1000):
+    """Return bytes allocated per object returned by func."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [func() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # Exclude the list holding the objects.
+    listsize = objects.__sizeof__()
+    return (after - before - listsize) / count
+
+
+def run(repeat=5, pattern=None):
+    """Run all benchmarks, returning OrderedDict of name to metric."""
+    results = OrderedDict()
+    for name, func in cases.timing_cases().items():
+        if pattern is None or pattern in name:
+            results[name] = {'value': time_per_call(func, repeat), 'unit': 'ns'}
+    for name, func in cases.memory_cases().items():
+        if pattern is None or pattern in name:
+            results[name] = {'value': memory_per_instance(func), 'unit': 'B'}
+    # Skipped where python -X importtime isn't available.
+    if importtime.SUPPORTED and (pattern is None or pattern in 'import.bettertimedelta'):
+        results['import.bettertimedelta'] = {
+            'value': importtime.import_time(repeat=repeat), 'unit': 'us'}
+    return results
+
+
+def save(path, results):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, results, threshold):
+    """Return list of (name, old, new) for metrics that regressed.
+
+    A metric regresses when it exceeds the baseline by more than threshold,
+    given as a fraction. Metrics missing from either side are ignored.
+    """
+    regressions = []
+    for name, metric in results.items():
+        try:
+            old = baseline[name]['value']
+        except KeyError:
+            continue
+        new = metric['value']
+        if new > old * (1 + threshold):
+            regressions.append((name, old, new))
+    return regressions
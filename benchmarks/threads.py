@@ -0,0 +1,102 @@
+"""Measure multi-threaded throughput scaling of TimeDelta.
+
+Usage::
+
+    python -m benchmarks.threads [--threads 1,2,4,8] [--duration 1.0]
+
+For each workload and thread count, threads run the workload for a fixed
+time and total throughput is compared with the single thread result.
+Efficiency is throughput / (threads * single thread throughput), so 100%
+means linear scaling. Builds with the GIL enabled are not expected to scale.
+"""
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from bettertimedelta import TimeDelta
+
+
+def _construct():
+    TimeDelta(seconds=1.5)
+    TimeDelta(seconds=-1)
+
+
+def _arithmetic():
+    td = TimeDelta(days=1, seconds=30)
+    (td + td) * 2 - timedelta(seconds=1)
+
+
+def _formatting():
+    td = TimeDelta(days=1, seconds=30)
+    str(td)
+    '{:%H:%M:%S}'.format(td)
+
+
+WORKLOADS = OrderedDict([
+    ('construct', _construct),
+    ('arithmetic', _arithmetic),
+    ('formatting', _formatting),
+])
+
+
+def throughput(func, threads, duration=1.0):
+    """Return total calls per second of func across threads."""
+    counts = [0] * threads
+    start = threading.Barrier(threads + 1)
+    stop = threading.Event()
+
+    def worker(index):
+        start.wait()
+        count = 0
+        while not stop.is_set():
+            for _ in range(100):
+                func()
+            count += 100
+        counts[index] = count
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - began)
+
+
+def gil_enabled():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def main(argv=None):
+    cpus = os.cpu_count() or 1
+    default_threads = sorted({1, 2, 4, 8, 16, cpus} & set(range(1, cpus + 1)))
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.threads')
+    parser.add_argument(
+        '--threads', default=','.join(map(str, default_threads)),
+        help='Comma separated thread counts (default: %(default)s).')
+    parser.add_argument('--duration', type=float, default=1.0, help='Seconds per measurement.')
+    args = parser.parse_args(argv)
+    thread_counts = [int(n) for n in args.threads.split(',')]
+
+    print('GIL enabled: {}, CPUs: {}'.format(gil_enabled(), cpus))
+    for name, func in WORKLOADS.items():
+        single = throughput(func, 1, args.duration)
+        for threads in thread_counts:
+            total = single if threads == 1 else throughput(func, threads, args.duration)
+            print('{:<12} threads={:<4} {:>12.0f} calls/s  efficiency={:.0%}'.format(
+                name, threads, total, total / (threads * single)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
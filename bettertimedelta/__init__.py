@@ -1,4 +1,4 @@
-from .core import TimeDelta
+from .core import TimeDelta, shift_datetimes
 
 __author__ = 'Frazer McLean <frazer@frazermclean.co.uk>'
 __version__ = '0.1.0'
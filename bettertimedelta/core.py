@@ -1,30 +1,28 @@
 # encoding: utf-8
 from __future__ import absolute_import, division, print_function
 
-import re
-from collections import OrderedDict
-from datetime import date, datetime, timedelta
-from decimal import (
-    ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, ROUND_HALF_EVEN, Decimal,
-    localcontext)
-from functools import partial
-from itertools import chain
-from numbers import Number
-
-from represent import ReprHelperMixin
+from datetime import date, timedelta
+from numbers import Integral, Number
 
+from . import instrumentation as _instrumentation
 from .constants import DAY, HOUR, MILLISECOND, MINUTE, SECOND, WEEK
-from .utils import read_only_property, timedelta_to_microseconds
+from .utils import (
+    LazyRegex, divide_round_half_even, exact_integer_ratio, operand_microseconds,
+    read_only_property, register_duration_type, timedelta_to_microseconds)
 
+# re, collections, itertools and represent are imported where they are used,
+# so that importing this module stays cheap. decimal is only imported by
+# utils.exact_integer_ratio for string and Decimal input.
 
-class TimeDelta(ReprHelperMixin, object):
-    _format_regex = re.compile('''
+
+class TimeDelta(object):
+    _format_regex = LazyRegex(r'''
         (?<!\%)     # Allow % to be escaped using %%
         \%          # % used to start keys
         (           # Capture group
             \w+     # Match items of _format_keys
         )
-        ''', re.VERBOSE)
+        ''', 'VERBOSE')
 
     # These attributes are verified by unit test.
     __ordered_attributes = [
@@ -42,6 +40,11 @@ class TimeDelta(ReprHelperMixin, object):
     # Consider this a mapping of format keys to __ordered_attributes
     _format_keys = ['w', 'd', 'h', 'm', 's', 'ms', 'us']
 
+    # Compiled __format__ specs, keyed by (class, format_spec). Cleared when
+    # it reaches _format_cache_size, so dynamic specs can't grow it forever.
+    _format_cache = {}
+    _format_cache_size = 256
+
     # Consider this a mapping of unit symbols to __ordered_attributes
     _symbol_keys = ['wk', 'd', 'h', 'min', 's', 'ms', 'µs']
 
@@ -78,79 +81,159 @@ class TimeDelta(ReprHelperMixin, object):
         - 0 <= milliseconds < 1000
         - 0 <= microseconds < 1000
         """
-        total_microseconds = Decimal(microseconds)
-        total_microseconds += Decimal(milliseconds) * MILLISECOND
-        total_microseconds += Decimal(seconds) * SECOND
-        total_microseconds += Decimal(minutes) * MINUTE
-        total_microseconds += Decimal(hours) * HOUR
-        total_microseconds += Decimal(days) * DAY
-        total_microseconds += Decimal(weeks) * WEEK
-
-        negative = total_microseconds < 0
-        remaining_microseconds = total_microseconds
-
-        weeks = days = hours = minutes = seconds = milliseconds = microseconds = 0
-
-        if negative:
-            # Normalisation method is that only weeks portion is negative.
-            # The other units are additive from there.
-            with localcontext() as ctx:
-                # Ensure we have enough precision for the following calculation,
-                # or weeks calculation will be nonzero (which it must be after
-                # negative_weeks calculations is performed)
-                dweek = Decimal(WEEK)
-                if remaining_microseconds.adjusted() >= ctx.prec + dweek.adjusted():
-                    ctx.prec = remaining_microseconds.adjusted() - dweek.adjusted() + 1
-
-                negative_weeks = remaining_microseconds.copy_abs() / WEEK
-                negative_weeks = negative_weeks.to_integral_exact(ROUND_CEILING)
-                remaining_microseconds = negative_weeks * WEEK - remaining_microseconds.copy_abs()
-
-        weeks = (remaining_microseconds / WEEK).to_integral_exact(ROUND_DOWN)
-        remaining_microseconds -= weeks * WEEK
-
-        days = (remaining_microseconds / DAY).to_integral_value(ROUND_FLOOR)
-        remaining_microseconds -= days * DAY
-
-        hours = (remaining_microseconds / HOUR).to_integral_value(ROUND_FLOOR)
-        remaining_microseconds -= hours * HOUR
-
-        minutes = (remaining_microseconds / MINUTE).to_integral_value(ROUND_FLOOR)
-        remaining_microseconds -= minutes * MINUTE
-
-        seconds = (remaining_microseconds / SECOND).to_integral_value(ROUND_FLOOR)
-        remaining_microseconds -= seconds * SECOND
-
-        milliseconds = (remaining_microseconds / MILLISECOND).to_integral_value(ROUND_FLOOR)
-        remaining_microseconds -= milliseconds * MILLISECOND
-
-        microseconds = remaining_microseconds.to_integral_value(ROUND_HALF_EVEN)
-
-        if negative:
-            # Weeks must be zero, because negative weeks has been special cased
-            # above to allow remaining logic to work. Here, we set it to the
-            # correct value.
-            assert weeks == 0
-            weeks = -negative_weeks
-
-        self._weeks = int(weeks)
-        self._days = int(days)
-        self._hours = int(hours)
-        self._minutes = int(minutes)
-        self._seconds = int(seconds)
-        self._milliseconds = int(milliseconds)
-        self._microseconds = int(microseconds)
-
-        self._total_microseconds = int(total_microseconds.to_integral_value(ROUND_HALF_EVEN))
+        # Check for exact int first, because the Integral ABC check is slow.
+        if ((type(weeks) is int or isinstance(weeks, Integral)) and
+                (type(days) is int or isinstance(days, Integral)) and
+                (type(hours) is int or isinstance(hours, Integral)) and
+                (type(minutes) is int or isinstance(minutes, Integral)) and
+                (type(seconds) is int or isinstance(seconds, Integral)) and
+                (type(milliseconds) is int or isinstance(milliseconds, Integral)) and
+                (type(microseconds) is int or isinstance(microseconds, Integral))):
+            # Integer input can be summed directly.
+            if _instrumentation.counters is not None:
+                _instrumentation.count('construct.integer')
+            total_microseconds = int(microseconds)
+            total_microseconds += int(milliseconds) * MILLISECOND
+            total_microseconds += int(seconds) * SECOND
+            total_microseconds += int(minutes) * MINUTE
+            total_microseconds += int(hours) * HOUR
+            total_microseconds += int(days) * DAY
+            total_microseconds += int(weeks) * WEEK
+            self._set_total_microseconds(total_microseconds)
+            return
+
+        if _instrumentation.counters is not None:
+            _instrumentation.count('construct.ratio')
+
+        # Other input is converted to exact integer ratios. Unlike Decimal
+        # arithmetic, this doesn't depend on the thread's decimal context.
+        numerator, denominator = 0, 1
+        for value, unit in ((weeks, WEEK), (days, DAY), (hours, HOUR),
+                            (minutes, MINUTE), (seconds, SECOND),
+                            (milliseconds, MILLISECOND), (microseconds, 1)):
+            value_numerator, value_denominator = exact_integer_ratio(value)
+            if value_denominator == denominator:
+                numerator += value_numerator * unit
+            else:
+                numerator = (numerator * value_denominator +
+                             value_numerator * unit * denominator)
+                denominator *= value_denominator
+
+        self._set_total_microseconds(
+            divide_round_half_even(numerator, denominator))
+
+    def _set_total_microseconds(self, total_microseconds):
+        """Normalise integer microseconds using integer arithmetic only.
+
+        Floor division leaves only the weeks portion negative. The other
+        units are additive from there.
+        """
+        self._total_microseconds = total_microseconds
+        self._timedelta = None
+        self._weeks, remaining = divmod(total_microseconds, WEEK)
+        self._days, remaining = divmod(remaining, DAY)
+        self._hours, remaining = divmod(remaining, HOUR)
+        self._minutes, remaining = divmod(remaining, MINUTE)
+        self._seconds, remaining = divmod(remaining, SECOND)
+        self._milliseconds, self._microseconds = divmod(remaining, MILLISECOND)
+
+    @classmethod
+    def _from_total_microseconds(cls, total_microseconds):
+        """Create instance from integer microseconds, bypassing __init__."""
+        if _instrumentation.counters is not None:
+            _instrumentation.count('construct.direct')
+        self = cls.__new__(cls)
+        self._set_total_microseconds(total_microseconds)
+        return self
+
+    @classmethod
+    def _from_scaled(cls, value, multiplier, divisor):
+        """Create instance from value * multiplier / divisor microseconds.
+
+        Rounds half to even.
+        """
+        numerator, denominator = exact_integer_ratio(value)
+        return cls._from_total_microseconds(divide_round_half_even(
+            numerator * multiplier, denominator * divisor))
 
     @classmethod
     def from_timedelta(cls, td):
         """Initialise from datetime.timedelta instance."""
-        return cls(microseconds=timedelta_to_microseconds(td))
+        return cls._from_total_microseconds(timedelta_to_microseconds(td))
+
+    @classmethod
+    def from_microseconds(cls, microseconds):
+        """Initialise from microseconds.
+
+        Integers are used exactly. Floats and fractions are converted exactly
+        and rounded half to even to the nearest microsecond, giving the same
+        result as ``TimeDelta(microseconds=microseconds)``.
+        """
+        if isinstance(microseconds, Integral):
+            return cls._from_total_microseconds(int(microseconds))
+        return cls._from_scaled(microseconds, 1, 1)
+
+    @classmethod
+    def from_seconds(cls, seconds):
+        """Initialise from seconds.
+
+        Integers are used exactly. Floats and fractions are converted exactly
+        (without expanding floats to Decimal) and rounded half to even to the
+        nearest microsecond, giving the same result as
+        ``TimeDelta(seconds=seconds)``.
+        """
+        if isinstance(seconds, Integral):
+            return cls._from_total_microseconds(int(seconds) * SECOND)
+        return cls._from_scaled(seconds, SECOND, 1)
+
+    @classmethod
+    def from_nanoseconds(cls, nanoseconds):
+        """Initialise from nanoseconds.
+
+        The value is rounded half to even to the nearest microsecond, giving
+        the same result as ``TimeDelta(microseconds=Fraction(nanoseconds, 1000))``.
+        """
+        return cls._from_scaled(nanoseconds, 1, 1000)
+
+    @classmethod
+    def from_perf_counter_delta(cls, start, end=None):
+        """Initialise from the difference between two performance counter values.
+
+        Float values are taken to be seconds from :func:`time.perf_counter`, and
+        integer values nanoseconds from :func:`time.perf_counter_ns`. Both values
+        must be the same kind, otherwise TypeError is raised. If `end` is
+        omitted, the counter matching the type of `start` is read now. This
+        requires Python 3.3+ for seconds or 3.7+ for nanoseconds, otherwise
+        RuntimeError is raised.
+
+        Rounding is the same as :meth:`from_seconds` and :meth:`from_nanoseconds`.
+        """
+        nanoseconds = isinstance(start, Integral)
+        if end is None:
+            import time
+            name = 'perf_counter_ns' if nanoseconds else 'perf_counter'
+            try:
+                counter = getattr(time, name)
+            except AttributeError:
+                raise RuntimeError(
+                    'time.{} is not available, so end must be given.'.format(name))
+            end = counter()
+        elif isinstance(end, Integral) != nanoseconds:
+            raise TypeError(
+                'start and end must both be integer nanoseconds or both be seconds.')
+
+        if nanoseconds:
+            return cls.from_nanoseconds(int(end) - int(start))
+        return cls.from_seconds(end - start)
 
     @classmethod
     def parse(cls, string):
         """This function is unfinished."""
+        if _instrumentation.counters is not None:
+            _instrumentation.count('parse')
+
+        import re
+        from itertools import chain
 
         # Sort by longest to shortest so 'min' isn't matched by 'm' etc.
         units = sorted(list(chain.from_iterable(cls._parse_units)), key=lambda u: len(u), reverse=True)
@@ -201,10 +284,12 @@ class TimeDelta(ReprHelperMixin, object):
     @property
     def _format_attr_map(self):
         """Map class _format_keys to attribute names."""
+        from collections import OrderedDict
         return OrderedDict(zip(self._format_keys, self.__ordered_attributes))
 
     @property
     def _parse_unit_attr_map(self):
+        from collections import OrderedDict
         return OrderedDict(zip(self._parse_units, self.__ordered_attributes))
 
     def as_dict(self):
@@ -213,7 +298,14 @@ class TimeDelta(ReprHelperMixin, object):
 
     def as_timedelta(self):
         """Return as instance of datetime.timedelta"""
-        return timedelta(microseconds=self._total_microseconds)
+        # timedelta is immutable, so it is created once and cached.
+        if self._timedelta is None:
+            self._timedelta = timedelta(microseconds=self._total_microseconds)
+        return self._timedelta
+
+    def apply_to(self, dates):
+        """Return list of each date or datetime in `dates` plus this duration."""
+        return shift_datetimes(dates, self)
 
     def __format__(self, format_spec):
         """ Provide format code parsing for `str.format()`
@@ -253,28 +345,68 @@ class TimeDelta(ReprHelperMixin, object):
         """
         if not format_spec:
             return str(self)
-        repl = partial(self._replace_format_keys, d=self.as_dict())
-        formatted = TimeDelta._format_regex.sub(repl, format_spec)
-        formatted = formatted.replace('%%', '%')
-
-        return formatted
-
-    def _replace_format_keys(self, match, d):
-        """Replace matched format codes from _format_regex with formatted number."""
-        spec_key = match.group(1)
 
+        key = (type(self), format_spec)
         try:
-            attr = self._format_attr_map[spec_key.lower()]
+            compiled = TimeDelta._format_cache[key]
         except KeyError:
-            raise ValueError('Invalid format string.')
-        number = getattr(self, attr)
+            compiled = self._compile_format_spec(format_spec)
+            if len(TimeDelta._format_cache) >= TimeDelta._format_cache_size:
+                TimeDelta._format_cache.clear()
+            TimeDelta._format_cache[key] = compiled
+        else:
+            if _instrumentation.counters is not None:
+                _instrumentation.count('format.cache_hit')
+
+        return ''.join(
+            piece if attr is None else self._format_number(getattr(self, attr), piece)
+            for piece, attr in compiled)
+
+    def _compile_format_spec(self, format_spec):
+        """Split format_spec into (literal, None) and (spec_key, attr) pieces."""
+        if _instrumentation.counters is not None:
+            _instrumentation.count('format.compile')
+
+        format_attr_map = self._format_attr_map
+        pieces = []
+        position = 0
+        for match in TimeDelta._format_regex.finditer(format_spec):
+            spec_key = match.group(1)
+            try:
+                attr = format_attr_map[spec_key.lower()]
+            except KeyError:
+                raise ValueError('Invalid format string.')
+            literal = format_spec[position:match.start()].replace('%%', '%')
+            if literal:
+                pieces.append((literal, None))
+            pieces.append((spec_key, attr))
+            position = match.end()
+        literal = format_spec[position:].replace('%%', '%')
+        if literal:
+            pieces.append((literal, None))
+        return tuple(pieces)
+
+    @staticmethod
+    def _format_number(number, spec_key):
+        """Format number for matched format code from _format_regex."""
         if spec_key in ('H', 'M', 'S'):
-            numstr = '{:02d}'.format(number)
+            return '{:02d}'.format(number)
         elif spec_key in ('mS', 'uS'):
-            numstr = '{:03d}'.format(number)
+            return '{:03d}'.format(number)
         else:
-            numstr = str(number)
-        return numstr
+            return str(number)
+
+    def __repr__(self):
+        from represent import ReprHelper
+        r = ReprHelper(self)
+        self._repr_helper_(r)
+        return str(r)
+
+    def _repr_pretty_(self, p, cycle):
+        """Pretty printer for IPython.lib.pretty."""
+        from represent import PrettyReprHelper
+        with PrettyReprHelper(self, p, cycle) as r:
+            self._repr_helper_(r)
 
     def _repr_helper_(self, r):
         """Provide canonical form of this instance."""
@@ -343,139 +475,193 @@ class TimeDelta(ReprHelperMixin, object):
         return ' '.join(parts)
 
     def __lt__(self, other):
-        if isinstance(other, TimeDelta):
-            return self.total_microseconds < other.total_microseconds
-        elif isinstance(other, timedelta):
-            return self.total_microseconds < timedelta_to_microseconds(other)
-        return NotImplemented
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__lt__', other)
+        other = operand_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._total_microseconds < other
 
     def __le__(self, other):
-        if isinstance(other, TimeDelta):
-            return self.total_microseconds <= other.total_microseconds
-        elif isinstance(other, timedelta):
-            return self.total_microseconds <= timedelta_to_microseconds(other)
-        return NotImplemented
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__le__', other)
+        other = operand_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._total_microseconds <= other
 
     def __eq__(self, other):
-        if isinstance(other, TimeDelta):
-            return self.total_microseconds == other.total_microseconds
-        elif isinstance(other, timedelta):
-            return self.total_microseconds == timedelta_to_microseconds(other)
-        return NotImplemented
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__eq__', other)
+        other = operand_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._total_microseconds == other
 
     def __ne__(self, other):
-        if isinstance(other, TimeDelta):
-            return self.total_microseconds != other.total_microseconds
-        elif isinstance(other, timedelta):
-            return self.total_microseconds != timedelta_to_microseconds(other)
-        return NotImplemented
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__ne__', other)
+        other = operand_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._total_microseconds != other
 
     def __gt__(self, other):
-        if isinstance(other, TimeDelta):
-            return self.total_microseconds > other.total_microseconds
-        elif isinstance(other, timedelta):
-            return self.total_microseconds > timedelta_to_microseconds(other)
-        return NotImplemented
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__gt__', other)
+        other = operand_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._total_microseconds > other
 
     def __ge__(self, other):
-        if isinstance(other, TimeDelta):
-            return self.total_microseconds >= other.total_microseconds
-        elif isinstance(other, timedelta):
-            return self.total_microseconds >= timedelta_to_microseconds(other)
-        return NotImplemented
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__ge__', other)
+        other = operand_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._total_microseconds >= other
 
     def __abs__(self):
-        if self.total_microseconds < 0:
+        if self._total_microseconds < 0:
             return -self
         else:
             return +self
 
     def __neg__(self):
-        return TimeDelta(microseconds=self.total_microseconds * -1)
+        return TimeDelta._from_total_microseconds(-self._total_microseconds)
 
     def __pos__(self):
-        return TimeDelta(microseconds=self.total_microseconds)
+        return TimeDelta._from_total_microseconds(self._total_microseconds)
 
     def __add__(self, other):
-        if isinstance(other, TimeDelta):
-            return TimeDelta(microseconds=self.total_microseconds + other.total_microseconds)
-        elif isinstance(other, timedelta):
-            return TimeDelta(microseconds=self.total_microseconds + timedelta_to_microseconds(other))
-        elif isinstance(other, (date, datetime)):
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__add__', other)
+        microseconds = operand_microseconds(other)
+        if microseconds is not None:
+            return TimeDelta._from_total_microseconds(self._total_microseconds + microseconds)
+        elif isinstance(other, date):
             return self.as_timedelta() + other
         else:
             return NotImplemented
 
     def __radd__(self, other):
-        if isinstance(other, timedelta):
-            return TimeDelta(microseconds=timedelta_to_microseconds(other) + self.total_microseconds)
-        elif isinstance(other, (date, datetime)):
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__radd__', other)
+        microseconds = operand_microseconds(other)
+        if microseconds is not None:
+            return TimeDelta._from_total_microseconds(microseconds + self._total_microseconds)
+        elif isinstance(other, date):
             return other + self.as_timedelta()
         else:
             return NotImplemented
 
     def __sub__(self, other):
-        if isinstance(other, TimeDelta):
-            return TimeDelta(microseconds=self.total_microseconds - other.total_microseconds)
-        elif isinstance(other, timedelta):
-            return TimeDelta(microseconds=self.total_microseconds - timedelta_to_microseconds(other))
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__sub__', other)
+        microseconds = operand_microseconds(other)
+        if microseconds is not None:
+            return TimeDelta._from_total_microseconds(self._total_microseconds - microseconds)
         else:
             return NotImplemented
 
     def __rsub__(self, other):
-        if isinstance(other, TimeDelta):
-            return TimeDelta(microseconds=other.total_microseconds - self.total_microseconds)
-        elif isinstance(other, timedelta):
-            return TimeDelta(microseconds=timedelta_to_microseconds(other) - self.total_microseconds)
-        elif isinstance(other, (date, datetime)):
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__rsub__', other)
+        microseconds = operand_microseconds(other)
+        if microseconds is not None:
+            return TimeDelta._from_total_microseconds(microseconds - self._total_microseconds)
+        elif isinstance(other, date):
             return other - self.as_timedelta()
         else:
             return NotImplemented
 
     def __mul__(self, other):
-        if isinstance(other, Number):
-            return TimeDelta(microseconds=self.total_microseconds * other)
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__mul__', other)
+        if isinstance(other, Integral):
+            return TimeDelta._from_total_microseconds(self._total_microseconds * int(other))
+        elif isinstance(other, Number):
+            return TimeDelta(microseconds=self._total_microseconds * other)
         else:
             return NotImplemented
 
     def __rmul__(self, other):
-        if isinstance(other, Number):
-            return TimeDelta(microseconds=self.total_microseconds * other)
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__rmul__', other)
+        if isinstance(other, Integral):
+            return TimeDelta._from_total_microseconds(self._total_microseconds * int(other))
+        elif isinstance(other, Number):
+            return TimeDelta(microseconds=self._total_microseconds * other)
         else:
             return NotImplemented
 
     def __truediv__(self, other):
-        if isinstance(other, TimeDelta):
-            return self.total_microseconds / other.total_microseconds
-        elif isinstance(other, timedelta):
-            return self.total_microseconds / timedelta_to_microseconds(other)
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__truediv__', other)
+        microseconds = operand_microseconds(other)
+        if microseconds is not None:
+            return self._total_microseconds / microseconds
+        elif isinstance(other, Integral):
+            return TimeDelta._from_total_microseconds(
+                divide_round_half_even(self._total_microseconds, int(other)))
         elif isinstance(other, Number):
-            return TimeDelta(microseconds=self.total_microseconds / other)
+            return TimeDelta(microseconds=self._total_microseconds / other)
         else:
             return NotImplemented
 
     def __floordiv__(self, other):
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__floordiv__', other)
         if isinstance(other, TimeDelta):
-            return self.total_microseconds // other.total_microseconds
+            return self._total_microseconds // other._total_microseconds
+        elif isinstance(other, Integral):
+            return TimeDelta._from_total_microseconds(self._total_microseconds // int(other))
         elif isinstance(other, Number):
-            return TimeDelta(microseconds=self.total_microseconds // other)
+            return TimeDelta(microseconds=self._total_microseconds // other)
         else:
             return NotImplemented
 
     __div__ = __floordiv__
 
     def __mod__(self, other):
-        if isinstance(other, TimeDelta):
-            return TimeDelta(microseconds=self.total_microseconds % other.total_microseconds)
-        elif isinstance(other, timedelta):
-            return TimeDelta(microseconds=self.total_microseconds % timedelta_to_microseconds(other))
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__mod__', other)
+        microseconds = operand_microseconds(other)
+        if microseconds is not None:
+            return TimeDelta._from_total_microseconds(self._total_microseconds % microseconds)
         else:
             return NotImplemented
 
     def __divmod__(self, other):
-        return self // other, self % other
+        if _instrumentation.counters is not None:
+            _instrumentation.count_operation('__divmod__', other)
+        # Not via // and %, which would be counted too.
+        if isinstance(other, TimeDelta):
+            quotient, remainder = divmod(self._total_microseconds, other._total_microseconds)
+            return quotient, TimeDelta._from_total_microseconds(remainder)
+        else:
+            return NotImplemented
 
     def __bool__(self):
-        return bool(self.total_microseconds)
+        return bool(self._total_microseconds)
 
     __nonzero__ = __bool__
+
+
+def _timedelta_total_microseconds(td):
+    return td._total_microseconds
+
+
+register_duration_type(TimeDelta, _timedelta_total_microseconds)
+
+
+def shift_datetimes(datetimes, td):
+    """Return list of each date or datetime in `datetimes` plus `td`.
+
+    `td` may be TimeDelta or datetime.timedelta. It is converted once, rather
+    than for each element.
+    """
+    if isinstance(td, TimeDelta):
+        td = td.as_timedelta()
+    return [dt + td for dt in datetimes]
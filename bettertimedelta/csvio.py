@@ -0,0 +1,322 @@
+# coding: utf-8
+"""Read and write duration columns of CSV files in bulk.
+
+Requires Python 3.3+, for ``array('q')`` and :mod:`csv` reading text. This
+module isn't imported by the package, so import it directly::
+
+    from bettertimedelta.csvio import read_columns, write_columns
+
+Cells are converted directly between text and integer microseconds, so no
+TimeDelta instances are created unless requested. Files should be opened in
+text mode with ``newline=''``, as for :mod:`csv`.
+
+Supported cell formats:
+
+- ``'str'``: output of ``str(td)`` or ``td.format()``, e.g.
+  ``'1 week, 2 days, 03:04:05.006007'``. Weeks, days and the fractional
+  seconds may be omitted when reading.
+- ``'symbols'``: output of ``td.format(symbols=True)``, e.g.
+  ``'1 wk 2 d 3 h 4 min 5 s 6 ms 7 µs'``. Any units may be omitted when
+  reading, but the rest must be in this order.
+- ``'microseconds'``: integer microseconds, e.g. ``'788645006007'``.
+- ``'auto'``: when reading, detect any of the above for each cell. Writing
+  uses ``'str'``.
+
+Durations are read into int64 arrays, so must be within about +/-292,000
+years. Cells outside this range or that can't be decoded, and rows without a
+cell for a requested column, raise ValueError naming the row and column. Rows
+are numbered from 1, including the header row.
+"""
+from __future__ import absolute_import, division, print_function
+
+import csv
+import re
+from array import array
+from itertools import islice
+from numbers import Integral
+
+from .constants import DAY, HOUR, MILLISECOND, MINUTE, SECOND, WEEK
+from .core import TimeDelta
+from .utils import duration_to_microseconds
+
+FORMATS = ('auto', 'str', 'symbols', 'microseconds')
+
+_UNITS = [WEEK, DAY, HOUR, MINUTE, SECOND, MILLISECOND, 1]
+
+_str_regex = re.compile(r'''
+    \s*
+    (?:([-+]?\d+)\s+weeks?,\s*)?
+    (?:([-+]?\d+)\s+days?,\s*)?
+    ([-+]?\d+):(\d+):(\d+)
+    (?:\.(\d{1,6}))?
+    \s*$
+    ''', re.VERBOSE)
+
+_microseconds_regex = re.compile(r'\s*[-+]?\d+\s*$')
+
+
+class TimeDeltaColumn(object):
+    """Sequence of TimeDelta created on access from integer microseconds."""
+
+    def __init__(self, microseconds, cls=TimeDelta):
+        self.microseconds = microseconds
+        self._cls = cls
+
+    def __len__(self):
+        return len(self.microseconds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._cls._from_total_microseconds(value)
+                    for value in self.microseconds[index]]
+        return self._cls._from_total_microseconds(self.microseconds[index])
+
+    def __iter__(self):
+        for value in self.microseconds:
+            yield self._cls._from_total_microseconds(value)
+
+
+class DurationChunk(object):
+    """Consecutive rows read by :func:`read_columns`.
+
+    Attributes:
+        rows: List of rows, each a list of strings as read by :mod:`csv`.
+        columns: Dict of requested column to ``array('q')`` of decoded
+                 microseconds.
+    """
+
+    def __init__(self, rows, columns, cls=TimeDelta):
+        self.rows = rows
+        self.columns = columns
+        self._cls = cls
+
+    def __len__(self):
+        return len(self.rows)
+
+    def timedeltas(self, column):
+        """Return column as a sequence creating TimeDelta on access."""
+        return TimeDeltaColumn(self.columns[column], self._cls)
+
+
+def _symbols_regex(cls):
+    """Match symbol format, with each unit optional but in order."""
+    return re.compile(r'\s*' + ''.join(
+        r'(?:([-+]?\d+)\s*' + re.escape(symbol) + r'(?:\s+|$))?'
+        for symbol in cls._symbol_keys) + '$')
+
+
+def _decoder(fmt, cls):
+    """Return function decoding a cell to integer microseconds."""
+    str_match = _str_regex.match
+    microseconds_match = _microseconds_regex.match
+    symbols_match = _symbols_regex(cls).match
+
+    def decode_microseconds(cell):
+        return int(cell)
+
+    def decode_str(cell):
+        match = str_match(cell)
+        if match is None:
+            raise ValueError('Cannot decode duration {!r}'.format(cell))
+        weeks, days, hours, minutes, seconds, fraction = match.groups()
+        total = int(hours) * HOUR + int(minutes) * MINUTE + int(seconds) * SECOND
+        if weeks:
+            total += int(weeks) * WEEK
+        if days:
+            total += int(days) * DAY
+        if fraction:
+            total += int(fraction.ljust(6, '0'))
+        return total
+
+    def decode_symbols(cell):
+        match = symbols_match(cell)
+        if match is None or not match.group(0).strip():
+            raise ValueError('Cannot decode duration {!r}'.format(cell))
+        total = 0
+        for value, unit in zip(match.groups(), _UNITS):
+            if value:
+                total += int(value) * unit
+        return total
+
+    def decode_auto(cell):
+        if microseconds_match(cell):
+            return int(cell)
+        elif ':' in cell:
+            return decode_str(cell)
+        return decode_symbols(cell)
+
+    decoders = {
+        'auto': decode_auto,
+        'str': decode_str,
+        'symbols': decode_symbols,
+        'microseconds': decode_microseconds,
+    }
+    try:
+        return decoders[fmt]
+    except KeyError:
+        raise ValueError('Unknown format {!r}, expected one of {}'.format(fmt, FORMATS))
+
+
+def _encoder(fmt, cls):
+    """Return function encoding a duration value as a cell."""
+    symbols = cls._symbol_keys
+    symbols_format = ' '.join('{} ' + symbol for symbol in symbols)
+
+    def encode_microseconds(value):
+        return str(duration_to_microseconds(value))
+
+    def encode_str(value):
+        # Equivalent to TimeDelta.__str__
+        weeks, remaining = divmod(duration_to_microseconds(value), WEEK)
+        days, remaining = divmod(remaining, DAY)
+        hours, remaining = divmod(remaining, HOUR)
+        minutes, remaining = divmod(remaining, MINUTE)
+        seconds, microseconds = divmod(remaining, SECOND)
+        return '{} {}, {} {}, {:02d}:{:02d}:{:02d}.{:06d}'.format(
+            weeks, 'week' if weeks == 1 else 'weeks',
+            days, 'day' if days == 1 else 'days',
+            hours, minutes, seconds, microseconds)
+
+    def encode_symbols(value):
+        # Equivalent to TimeDelta.format(symbols=True)
+        remaining = duration_to_microseconds(value)
+        parts = []
+        for unit in _UNITS:
+            part, remaining = divmod(remaining, unit)
+            parts.append(part)
+        return symbols_format.format(*parts)
+
+    encoders = {
+        'auto': encode_str,
+        'str': encode_str,
+        'symbols': encode_symbols,
+        'microseconds': encode_microseconds,
+    }
+    try:
+        return encoders[fmt]
+    except KeyError:
+        raise ValueError('Unknown format {!r}, expected one of {}'.format(fmt, FORMATS))
+
+
+def _column_formats(columns, formats):
+    if isinstance(formats, dict):
+        return [formats.get(column, 'auto') for column in columns]
+    return [formats] * len(columns)
+
+
+def _column_indices(columns, header):
+    indices = []
+    for column in columns:
+        if isinstance(column, Integral):
+            indices.append(int(column))
+        elif header is None:
+            raise ValueError('Column names require a header row.')
+        else:
+            try:
+                indices.append(header.index(column))
+            except ValueError:
+                raise ValueError('Column {!r} not in header.'.format(column))
+    return indices
+
+
+def _cell_error(rows_before, column, reason):
+    return ValueError('Row {}, column {!r}: {}'.format(rows_before + 1, column, reason))
+
+
+def read_columns(f, columns, formats='auto', header=True, chunk_size=65536,
+                 missing=None, cls=TimeDelta, **fmtparams):
+    """Read duration columns from CSV file in chunks.
+
+    Yields :class:`DurationChunk` for each `chunk_size` rows, so only one
+    chunk is held in memory at a time.
+
+    Parameters:
+        f: File object opened with ``newline=''``.
+        columns: Column names from the header row, or zero-based indices.
+        formats: Format for all columns, or dict of column to format.
+        header (bool): Whether the first row is a header. It is skipped
+                       in the output.
+        chunk_size (int): Rows per chunk.
+        missing (int): Microseconds to use for empty cells. By default,
+                       empty cells raise ValueError.
+        cls: TimeDelta subclass, used for symbols and by
+             :meth:`DurationChunk.timedeltas`.
+        **fmtparams: Passed to :func:`csv.reader`.
+    """
+    reader = csv.reader(f, **fmtparams)
+    header_row = next(reader, None) if header else None
+    indices = _column_indices(columns, header_row)
+    decoders = [_decoder(fmt, cls) for fmt in _column_formats(columns, formats)]
+    triples = list(zip(columns, indices, decoders))
+    # Rows before the current chunk
+    rows_read = 0 if header_row is None else 1
+
+    while True:
+        rows = list(islice(reader, chunk_size))
+        if not rows:
+            return
+        buffers = []
+        for column, index, decode in triples:
+            values = array('q')
+            append = values.append
+            try:
+                for row in rows:
+                    cell = row[index]
+                    if not cell and missing is not None:
+                        append(missing)
+                    else:
+                        append(decode(cell))
+            except IndexError:
+                raise _cell_error(rows_read + len(values), column,
+                                  'row has {} cells'.format(len(row)))
+            except OverflowError:
+                raise _cell_error(rows_read + len(values), column,
+                                  'duration {!r} out of int64 range'.format(cell))
+            except ValueError as exc:
+                raise _cell_error(rows_read + len(values), column, exc)
+            buffers.append(values)
+        rows_read += len(rows)
+        yield DurationChunk(rows, dict(zip(columns, buffers)), cls)
+
+
+def write_columns(f, rows, columns, formats='str', header=None, cls=TimeDelta,
+                  **fmtparams):
+    """Write rows to CSV file, encoding duration columns.
+
+    Rows are written as they are consumed, so `rows` may be a generator over
+    more rows than fit in memory.
+
+    Parameters:
+        f: File object opened with ``newline=''``.
+        rows: Iterable of row sequences. Cells in duration columns may be
+              TimeDelta, datetime.timedelta or integer microseconds.
+              ``None`` is written as an empty cell.
+        columns: Column names from `header`, or zero-based indices.
+        formats: Format for all columns, or dict of column to format.
+        header: Optional header row to write first.
+        cls: TimeDelta subclass whose symbols are used.
+        **fmtparams: Passed to :func:`csv.writer`.
+    """
+    writer = csv.writer(f, **fmtparams)
+    if header is not None:
+        header = list(header)
+        writer.writerow(header)
+    indices = _column_indices(columns, header)
+    encoders = [_encoder(fmt, cls) for fmt in _column_formats(columns, formats)]
+    triples = list(zip(columns, indices, encoders))
+    rows_before = 0 if header is None else 1
+
+    def encoded_rows():
+        for number, row in enumerate(rows, rows_before):
+            row = list(row)
+            for column, index, encode in triples:
+                try:
+                    value = row[index]
+                except IndexError:
+                    raise _cell_error(number, column, 'row has {} cells'.format(len(row)))
+                if value is not None:
+                    row[index] = encode(value)
+            yield row
+
+    writer.writerows(encoded_rows())
+
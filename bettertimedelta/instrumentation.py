@@ -0,0 +1,116 @@
+"""Opt-in usage counters for profiling TimeDelta.
+
+Counting is disabled by default. While disabled, instrumented code paths only
+check that `counters` is None.
+
+Counter keys:
+
+- ``construct.integer``: __init__ with integer arguments.
+- ``construct.ratio``: __init__ with non-integer arguments, which are
+  converted to exact integer ratios.
+- ``construct.direct``: alternate constructors and operator results, which
+  bypass __init__.
+- ``op.<method>.<operand type>``: operator calls, where operand type is
+  one of ``TimeDelta``, ``timedelta``, ``datetime``, ``date``, ``Number``
+  or ``other``.
+- ``parse``: calls to TimeDelta.parse.
+- ``format.compile``: format specs compiled by __format__.
+- ``format.cache_hit``: format specs found in the cache.
+
+Counts are not locked, so they may be approximate when TimeDelta is used
+from several threads at once.
+"""
+from __future__ import absolute_import, division, print_function
+
+from datetime import date, datetime, timedelta
+from numbers import Number
+
+#: dict of counter key to count while enabled, otherwise None.
+counters = None
+
+_export_hooks = []
+
+
+def enable():
+    """Start counting. Existing counts are kept."""
+    global counters
+    if counters is None:
+        counters = dict()
+
+
+def disable():
+    """Stop counting and discard counts."""
+    global counters
+    counters = None
+
+
+def is_enabled():
+    return counters is not None
+
+
+def reset():
+    """Set all counts to zero."""
+    if counters is not None:
+        counters.clear()
+
+
+def snapshot():
+    """Return a copy of the current counts."""
+    if counters is None:
+        return dict()
+    return dict(counters)
+
+
+def count(key):
+    # Read counters once, as another thread may disable counting after the
+    # caller checked it.
+    counts = counters
+    if counts is not None:
+        counts[key] = counts.get(key, 0) + 1
+
+
+def count_operation(name, other):
+    """Count operator `name` by the type of `other`."""
+    counts = counters
+    if counts is None:
+        return
+
+    from .core import TimeDelta
+
+    if isinstance(other, TimeDelta):
+        kind = 'TimeDelta'
+    elif isinstance(other, timedelta):
+        kind = 'timedelta'
+    elif isinstance(other, datetime):
+        kind = 'datetime'
+    elif isinstance(other, date):
+        kind = 'date'
+    elif isinstance(other, Number):
+        kind = 'Number'
+    else:
+        kind = 'other'
+    key = 'op.{}.{}'.format(name, kind)
+    counts[key] = counts.get(key, 0) + 1
+
+
+def add_export_hook(hook):
+    """Register callable to receive snapshots from `export`."""
+    _export_hooks.append(hook)
+
+
+def remove_export_hook(hook):
+    _export_hooks.remove(hook)
+
+
+def export(reset_counts=False):
+    """Pass a snapshot to each export hook and return it.
+
+    Parameters:
+        reset_counts (bool): Reset counts after taking the snapshot.
+    """
+    data = snapshot()
+    if reset_counts:
+        reset()
+    for hook in list(_export_hooks):
+        hook(data)
+    return data
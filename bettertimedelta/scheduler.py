@@ -0,0 +1,252 @@
+"""asyncio timer scheduling using a hierarchical timing wheel.
+
+Requires Python 3.7+. This module isn't imported by the package, so import it
+directly::
+
+    from bettertimedelta.scheduler import TimingWheelScheduler
+"""
+from __future__ import absolute_import, division, print_function
+
+import asyncio
+import math
+from numbers import Integral
+
+from .constants import MILLISECOND, SECOND
+from .utils import duration_to_microseconds
+
+
+class TimerHandle(object):
+    """Handle for callback scheduled by :class:`TimingWheelScheduler`."""
+
+    __slots__ = ('_scheduler', '_tick', '_callback', '_args', '_slot')
+
+    def __init__(self, scheduler, tick, callback, args):
+        self._scheduler = scheduler
+        self._tick = tick
+        self._callback = callback
+        self._args = args
+        self._slot = None
+
+    def when(self):
+        """Return loop time at which the callback is due."""
+        return self._scheduler._tick_time(self._tick)
+
+    def cancel(self):
+        """Cancel the callback. Does nothing if it has already run."""
+        if self._slot is not None:
+            del self._slot[self]
+            self._slot = None
+            self._scheduler._pending -= 1
+        self._callback = self._args = None
+
+    def cancelled(self):
+        return self._callback is None
+
+
+class TimingWheelScheduler(object):
+    """Schedule callbacks on an asyncio loop using a hierarchical timing wheel.
+
+    Scheduling and cancelling are O(1). The loop only has one timer of its own,
+    for the next tick that needs processing.
+
+    Parameters:
+        resolution: Tick length, as integer microseconds (e.g.
+                    ``constants.MILLISECOND``, ``constants.SECOND`` or
+                    ``constants.MINUTE``), TimeDelta or timedelta.
+                    Callbacks run at the first tick at or after they are due,
+                    so they may run up to one tick late, but never early.
+        wheel_size (int): Slots in each level of the wheel.
+        levels (int): Number of levels. Timers further away than
+                      ``wheel_size ** levels`` ticks are kept in an overflow
+                      list until they fit.
+        loop: Event loop. Defaults to the running loop when first used.
+
+    :meth:`sleep` returns a future, rather than being a coroutine, so this
+    module can still be byte-compiled by older Python versions.
+    """
+
+    def __init__(self, resolution=MILLISECOND, wheel_size=256, levels=4, loop=None):
+        if not isinstance(resolution, Integral):
+            resolution = duration_to_microseconds(resolution, integers=False)
+        if resolution <= 0:
+            raise ValueError('resolution must be positive')
+        if wheel_size < 2 or levels < 1:
+            raise ValueError('wheel_size must be at least 2 and levels at least 1')
+
+        self.resolution = int(resolution)
+        self.wheel_size = wheel_size
+        self.levels = levels
+        self._loop = loop
+        self._origin = None
+        self._tick = 0
+        self._pending = 0
+        self._wheels = [[{} for _ in range(wheel_size)] for _ in range(levels)]
+        self._overflow = {}
+        self._wakeup = None
+        self._wakeup_tick = None
+
+    def __len__(self):
+        """Return number of pending callbacks."""
+        return self._pending
+
+    def call_later(self, delay, callback, *args):
+        """Run callback(*args) after delay, given as TimeDelta or timedelta.
+
+        Returns a :class:`TimerHandle`.
+        """
+        delay = duration_to_microseconds(delay, integers=False)
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        if self._origin is None:
+            self._origin = self._loop.time()
+
+        if not self._pending:
+            # Nothing to process in between, so jump straight to now.
+            self._tick = self._now_microseconds() // self.resolution
+
+        # Round up both the current time and the tick, so callbacks never
+        # run early.
+        due = self._now_microseconds(ceil=True) + max(delay, 0)
+        tick = -(-due // self.resolution)
+        handle = TimerHandle(self, max(tick, self._tick + 1), callback, args)
+        self._insert(handle)
+        self._pending += 1
+        # The wakeup is never later than any pending timer, so only an
+        # earlier one is needed, without scanning the wheel.
+        if self._wakeup is None or handle._tick < self._wakeup_tick:
+            self._set_wakeup(handle._tick)
+        return handle
+
+    def sleep(self, delay, result=None):
+        """Return future that completes with result after delay.
+
+        Cancelling the future cancels the timer.
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        future = self._loop.create_future()
+        handle = self.call_later(delay, _set_result_unless_cancelled, future, result)
+        future.add_done_callback(lambda future: handle.cancel())
+        return future
+
+    def close(self):
+        """Cancel all pending callbacks."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = self._wakeup_tick = None
+        for wheel in self._wheels:
+            for slot in wheel:
+                for handle in list(slot):
+                    handle.cancel()
+        for handle in list(self._overflow):
+            handle.cancel()
+
+    def _now_microseconds(self, ceil=False):
+        """Return microseconds since origin, rounded down unless ceil is True."""
+        elapsed = (self._loop.time() - self._origin) * SECOND
+        return int(math.ceil(elapsed)) if ceil else int(math.floor(elapsed))
+
+    def _tick_time(self, tick):
+        return self._origin + tick * self.resolution / SECOND
+
+    def _insert(self, handle):
+        """Place handle in the slot for its tick, relative to current tick."""
+        delta = handle._tick - self._tick
+        span = self.wheel_size
+        for level, wheel in enumerate(self._wheels):
+            if delta < span:
+                slot = wheel[handle._tick // (span // self.wheel_size) % self.wheel_size]
+                break
+            span *= self.wheel_size
+        else:
+            slot = self._overflow
+        slot[handle] = None
+        handle._slot = slot
+
+    def _cascade(self):
+        """Move timers down from higher levels at wheel boundaries."""
+        span = 1
+        for level in range(1, self.levels + 1):
+            span *= self.wheel_size
+            if self._tick % span:
+                return
+            if level == self.levels:
+                slot = self._overflow
+                self._overflow = {}
+            else:
+                wheel = self._wheels[level]
+                index = self._tick // span % self.wheel_size
+                slot = wheel[index]
+                wheel[index] = {}
+            for handle in slot:
+                self._insert(handle)
+
+    def _advance(self, tick):
+        """Process ticks up to and including tick."""
+        wheel = self._wheels[0]
+        while self._tick < tick and self._pending:
+            self._tick += 1
+            self._cascade()
+            index = self._tick % self.wheel_size
+            slot = wheel[index]
+            if not slot:
+                continue
+            wheel[index] = {}
+            for handle in slot:
+                handle._slot = None
+                self._pending -= 1
+            for handle in slot:
+                self._run(handle)
+        if not self._pending:
+            self._tick = max(self._tick, tick)
+
+    def _run(self, handle):
+        callback, args = handle._callback, handle._args
+        if callback is None:
+            return
+        handle._callback = handle._args = None
+        try:
+            callback(*args)
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            self._loop.call_exception_handler({
+                'message': 'Exception in callback {!r}'.format(callback),
+                'exception': exc,
+                'handle': handle,
+            })
+
+    def _next_tick(self):
+        """Return next tick with due timers, or the next wheel boundary."""
+        wheel = self._wheels[0]
+        boundary = self._tick - self._tick % self.wheel_size + self.wheel_size
+        for tick in range(self._tick + 1, boundary):
+            if wheel[tick % self.wheel_size]:
+                return tick
+        return boundary
+
+    def _schedule_wakeup(self):
+        if not self._pending:
+            if self._wakeup is not None:
+                self._wakeup.cancel()
+                self._wakeup = self._wakeup_tick = None
+            return
+        tick = self._next_tick()
+        if self._wakeup is None or tick < self._wakeup_tick:
+            self._set_wakeup(tick)
+
+    def _set_wakeup(self, tick):
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._wakeup_tick = tick
+        self._wakeup = self._loop.call_at(self._tick_time(tick), self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._wakeup = self._wakeup_tick = None
+        self._advance(self._now_microseconds() // self.resolution)
+        self._schedule_wakeup()
+
+
+def _set_result_unless_cancelled(future, result):
+    if not future.cancelled():
+        future.set_result(result)
@@ -0,0 +1,168 @@
+"""Durations stored in shared memory for use across processes.
+
+Requires Python 3.8+ for :mod:`multiprocessing.shared_memory`. This module
+isn't imported by the package, so import it directly::
+
+    from bettertimedelta.shared import SharedTimeDeltaArray
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+from array import array
+from multiprocessing import parent_process, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from .core import TimeDelta
+from .utils import duration_to_microseconds
+
+_ITEMSIZE = 8
+# The first int64 holds the length, because the shared memory block may be
+# larger than requested.
+_HEADER = 1
+
+
+# Names created by this process, or by the parent before a fork.
+_created = set()
+
+
+def _shares_creator_tracker(name):
+    """Return whether attaching registers with the creator's resource tracker.
+
+    Before Python 3.13, attaching registers the memory with this process's
+    resource tracker. Registering with the creator's tracker again is
+    harmless, but unregistering would drop the creator's registration. This
+    happens in the creating process, and in multiprocessing children, which
+    share their parent's tracker.
+    """
+    if os.name != 'posix' or name in _created:
+        return True
+    # Children inherit the tracker connection from their parent. There is no
+    # public way to check this, so it reads the private tracker fd, checked
+    # against CPython 3.8 to 3.12. attach doesn't call this from 3.13.
+    return (parent_process() is not None and
+            resource_tracker._resource_tracker._fd is not None)
+
+
+def _pack(values):
+    return memoryview(array('q', values))
+
+
+class SharedTimeDeltaArray(object):
+    """Fixed length array of durations in shared memory.
+
+    Durations are stored as int64 microseconds, so each element must be
+    within about +/-292,000 years. Indexing returns TimeDelta instances, and
+    accepts TimeDelta, datetime.timedelta or integer microseconds on
+    assignment.
+
+    Pickling only transfers the shared memory name, so passing an instance to
+    worker processes attaches to the same memory instead of copying it.
+
+    The creating process owns the memory and should call :meth:`unlink` once
+    all processes are finished. Every process should call :meth:`close`, or
+    use the instance as a context manager.
+    """
+
+    def __init__(self, shm):
+        """Wrap existing SharedMemory. Use :meth:`create` or :meth:`attach`."""
+        self._shm = shm
+        buf = shm.buf.cast('q')
+        self._length = buf[0]
+        self._buf = buf[_HEADER:_HEADER + self._length]
+        buf.release()
+
+    @classmethod
+    def create(cls, length, name=None):
+        """Create zeroed array of `length` durations in new shared memory."""
+        if length < 0:
+            raise ValueError('length must not be negative')
+        shm = SharedMemory(name=name, create=True, size=(_HEADER + length) * _ITEMSIZE)
+        _created.add(shm.name)
+        buf = shm.buf.cast('q')
+        buf[0] = length
+        buf.release()
+        return cls(shm)
+
+    @classmethod
+    def from_iterable(cls, values, name=None):
+        """Create array in new shared memory containing `values`."""
+        # Pack first, so values outside the int64 range raise before the
+        # shared memory exists.
+        packed = _pack([duration_to_microseconds(value) for value in values])
+        shared = cls.create(len(packed), name=name)
+        shared._buf[:] = packed
+        return shared
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to array created by another process."""
+        # Only the creating process should unlink the memory, so it mustn't
+        # stay registered with this process's resource tracker, which
+        # unlinks it when this process exits.
+        if sys.version_info >= (3, 13):
+            return cls(SharedMemory(name=name, track=False))
+
+        shares_tracker = _shares_creator_tracker(name)
+        shm = SharedMemory(name=name)
+        if not shares_tracker:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm)
+
+    @property
+    def name(self):
+        """Shared memory name, for :meth:`attach`."""
+        return self._shm.name
+
+    @property
+    def microseconds(self):
+        """Writable int64 memoryview of durations in microseconds.
+
+        Use this for bulk access, e.g. with ``numpy.asarray``.
+        """
+        return self._buf
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TimeDelta._from_total_microseconds(value)
+                    for value in self._buf[index].tolist()]
+        return TimeDelta._from_total_microseconds(self._buf[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._buf[index] = _pack([duration_to_microseconds(v) for v in value])
+        else:
+            self._buf[index] = duration_to_microseconds(value)
+
+    def __iter__(self):
+        for value in self._buf.tolist():
+            yield TimeDelta._from_total_microseconds(value)
+
+    def tolist(self):
+        """Return durations as list of integer microseconds."""
+        return self._buf.tolist()
+
+    def close(self):
+        """Close access to the shared memory from this instance."""
+        self._buf.release()
+        self._shm.close()
+
+    def unlink(self):
+        """Request the shared memory be destroyed, once all processes close it."""
+        self._shm.unlink()
+        _created.discard(self._shm.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __reduce__(self):
+        return type(self).attach, (self.name,)
+
+    def __repr__(self):
+        return '{}.attach({!r})'.format(type(self).__name__, self.name)
@@ -1,7 +1,30 @@
 from __future__ import absolute_import, division, print_function
 
+from datetime import timedelta
+from numbers import Integral, Rational
+
 from .constants import DAY, SECOND, MICROSECOND
 
+class LazyRegex(object):
+    """Class attribute descriptor compiling a regular expression on first use.
+
+    Flags are given by name, e.g. 'VERBOSE', so that the re module isn't
+    imported until the pattern is needed.
+    """
+    def __init__(self, pattern, *flags):
+        self.pattern = pattern
+        self.flags = flags
+        self.compiled = None
+
+    def __get__(self, instance, owner):
+        if self.compiled is None:
+            import re
+            flags = 0
+            for flag in self.flags:
+                flags |= getattr(re, flag)
+            self.compiled = re.compile(self.pattern, flags)
+        return self.compiled
+
 def read_only_property(name):
     return property(lambda self: getattr(self, name))
 
@@ -11,3 +34,98 @@ def timedelta_to_microseconds(td):
     microseconds += td.seconds * SECOND
     microseconds += td.microseconds * MICROSECOND
     return microseconds
+
+# Duration types, most specific first, and dispatch table of type to
+# converter to microseconds. TimeDelta is registered by core. Subclasses are
+# added to the table as they are seen. Unsupported types aren't stored, so the
+# table can't grow with arbitrary operand types.
+_duration_types = [(timedelta, timedelta_to_microseconds)]
+_duration_converters = {timedelta: timedelta_to_microseconds}
+
+def register_duration_type(cls, converter):
+    """Convert instances of cls, including subclasses, using converter."""
+    _duration_types.insert(0, (cls, converter))
+    _duration_converters[cls] = converter
+
+def operand_microseconds(value):
+    """Return duration in microseconds, or None if not a duration type."""
+    cls = type(value)
+    try:
+        converter = _duration_converters[cls]
+    except KeyError:
+        for base, converter in _duration_types:
+            if issubclass(cls, base):
+                break
+        else:
+            return None
+        _duration_converters[cls] = converter
+    return converter(value)
+
+def duration_to_microseconds(value, integers=True):
+    """Convert TimeDelta or timedelta to microseconds.
+
+    Integers are taken to be microseconds already, unless integers is False.
+    Raises TypeError for anything else.
+    """
+    microseconds = operand_microseconds(value)
+    if microseconds is not None:
+        return microseconds
+    elif integers and isinstance(value, Integral):
+        return int(value)
+    if integers:
+        expected = 'TimeDelta, timedelta or integer microseconds'
+    else:
+        expected = 'TimeDelta or timedelta'
+    raise TypeError('Expected {}, got {!r}'.format(expected, type(value).__name__))
+
+# Decimal values smaller than 10 ** _MIN_EXPONENT are replaced by a single
+# digit below it, so inputs like '1e-10000000' don't build huge denominators.
+# Floats and decimals above about 1e-1087 are on a much coarser grid, even
+# multiplied by a week in microseconds, so such a value can only decide a
+# rounding tie, which the replacement does the same way.
+_MIN_EXPONENT = -1100
+
+def exact_integer_ratio(value):
+    """Return exact (numerator, denominator) for value.
+
+    Integers, floats and other rational numbers are converted directly. Any
+    other value, e.g. a string or decimal.Decimal, is converted with the
+    Decimal constructor, which is exact and ignores the decimal context's
+    precision and rounding. Nonzero decimal values smaller than 1e-1100 are
+    replaced by +/-1e-1101.
+    """
+    if isinstance(value, Integral):
+        return int(value), 1
+    elif isinstance(value, float):
+        return value.as_integer_ratio()
+    elif isinstance(value, Rational):
+        return int(value.numerator), int(value.denominator)
+
+    from decimal import Decimal
+    sign, digits, exponent = Decimal(value).as_tuple()
+    if exponent == 'F':
+        raise OverflowError('cannot convert Infinity to integer ratio')
+    elif exponent in ('n', 'N'):
+        raise ValueError('cannot convert NaN to integer ratio')
+    numerator = 0
+    for digit in digits:
+        numerator = numerator * 10 + digit
+    if sign:
+        numerator = -numerator
+    if exponent >= 0:
+        return numerator * 10 ** exponent, 1
+    elif numerator == 0:
+        return 0, 1
+    elif len(digits) + exponent <= _MIN_EXPONENT:
+        return -1 if sign else 1, 10 ** (1 - _MIN_EXPONENT)
+    return numerator, 10 ** -exponent
+
+def divide_round_half_even(numerator, denominator):
+    """Divide integers, rounding half to even like ROUND_HALF_EVEN."""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(numerator, denominator)
+    remainder *= 2
+    if remainder > denominator or (remainder == denominator and quotient % 2):
+        quotient += 1
+    return quotient
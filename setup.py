@@ -44,7 +44,7 @@ setup(
     author=AUTHOR,
     author_email=EMAIL,
     url='https://github.com/RazerM/bettertimedelta',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     cmdclass={'test': PyTest},
     classifiers=[
         'Development Status :: 3 - Alpha',
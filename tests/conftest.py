@@ -0,0 +1,13 @@
+from __future__ import absolute_import, division, print_function
+
+import sys
+
+collect_ignore = []
+
+# These tests use async def and asyncio.get_running_loop.
+if sys.version_info < (3, 7):
+    collect_ignore.append('test_scheduler.py')
+
+# csvio uses array('q') and text mode csv, which require Python 3.3+.
+if sys.version_info < (3, 3):
+    collect_ignore.append('test_csvio.py')
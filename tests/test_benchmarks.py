@@ -0,0 +1,32 @@
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+# The benchmarks use tracemalloc, contextlib.redirect_stdout and
+# os.cpu_count, which require Python 3.4+.
+pytest.importorskip('tracemalloc')
+
+from benchmarks import cases, threads
+from benchmarks.runner import compare
+
+
+def test_cases_run():
+    for func in cases.timing_cases().values():
+        func()
+    for func in cases.memory_cases().values():
+        func()
+
+
+def test_compare():
+    baseline = {'a': {'value': 100.0}, 'b': {'value': 100.0}}
+    results = {
+        'a': {'value': 124.0},
+        'b': {'value': 126.0},
+        'c': {'value': 1000.0},
+    }
+    assert compare(baseline, results, 0.25) == [('b', 100.0, 126.0)]
+
+
+def test_threads_throughput():
+    for func in threads.WORKLOADS.values():
+        assert threads.throughput(func, 2, duration=0.01) > 0
@@ -0,0 +1,113 @@
+# coding: utf-8
+from __future__ import absolute_import, division, print_function
+
+import csv
+import io
+from datetime import timedelta
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers
+
+from bettertimedelta import TimeDelta
+from bettertimedelta.csvio import read_columns, write_columns
+
+
+@given(integers(-10**15, 10**15))
+def test_encode_matches_timedelta(microseconds):
+    td = TimeDelta(microseconds=microseconds)
+    formats = {0: 'str', 1: 'symbols', 2: 'microseconds'}
+    f = io.StringIO(newline='')
+    write_columns(f, [[td, td, td]], [0, 1, 2], formats=formats)
+
+    f.seek(0)
+    assert next(csv.reader(f)) == [str(td), td.format(symbols=True), str(microseconds)]
+
+    for read_formats in [formats, 'auto']:
+        f.seek(0)
+        [chunk] = read_columns(f, [0, 1, 2], formats=read_formats, header=False)
+        assert [list(chunk.columns[i]) for i in range(3)] == [[microseconds]] * 3
+
+
+def test_decode_variants():
+    td = TimeDelta(weeks=1, hours=23, minutes=59, seconds=59, milliseconds=999, microseconds=999)
+    cells = [
+        td.format(hide_zeros=True),
+        td.format(hide_micro=True),
+        td.format(hide_milli=True),
+        td.format(symbols=True, hide_zeros=True),
+        td.format(symbols=True, hide_micro=True),
+        '5s',
+    ]
+    f = io.StringIO('\n'.join('"{}"'.format(cell) for cell in cells), newline='')
+    [chunk] = read_columns(f, [0], header=False)
+    assert list(chunk.timedeltas(0)) == [
+        td,
+        td - TimeDelta(microseconds=999),
+        td - TimeDelta(milliseconds=999, microseconds=999),
+        td,
+        td - TimeDelta(microseconds=999),
+        TimeDelta(seconds=5),
+    ]
+
+
+def test_chunks_and_names():
+    rows = [['id{}'.format(i), timedelta(seconds=i), TimeDelta(minutes=i)] for i in range(10)]
+    f = io.StringIO(newline='')
+    write_columns(f, iter(rows), ['a', 'b'], formats={'a': 'microseconds', 'b': 'symbols'},
+                  header=['id', 'a', 'b'])
+    f.seek(0)
+
+    chunks = list(read_columns(f, ['b', 'a'], chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert chunks[1].rows[0][0] == 'id4'
+    assert chunks[2].timedeltas('b')[1] == TimeDelta(minutes=9)
+    assert chunks[2].timedeltas('a')[:] == [TimeDelta(seconds=8), TimeDelta(seconds=9)]
+    assert chunks[0].columns['a'].typecode == 'q'
+
+
+def test_missing_and_errors():
+    f = io.StringIO('a,b\r\n1,\r\n', newline='')
+    with pytest.raises(ValueError):
+        list(read_columns(f, ['b']))
+
+    f.seek(0)
+    [chunk] = read_columns(f, ['b'], missing=-1)
+    assert list(chunk.columns['b']) == [-1]
+
+    f.seek(0)
+    with pytest.raises(ValueError):
+        list(read_columns(f, ['c']))
+
+    f.seek(0)
+    with pytest.raises(ValueError):
+        list(read_columns(f, ['a'], formats='bad'))
+
+    for fmt in ['auto', 'str', 'symbols', 'microseconds']:
+        f = io.StringIO('1 fortnight\r\n', newline='')
+        with pytest.raises(ValueError):
+            list(read_columns(f, [0], formats=fmt, header=False))
+
+    f = io.StringIO(newline='')
+    write_columns(f, [[None]], [0])
+    assert f.getvalue() == '""\r\n'
+    with pytest.raises(TypeError):
+        write_columns(f, [[1.5]], [0])
+
+
+def test_errors_name_row_and_column():
+    f = io.StringIO('a,b\r\n1,2\r\n3,4\r\n5\r\n', newline='')
+    with pytest.raises(ValueError, match=r"Row 4, column 'b': row has 1 cells"):
+        list(read_columns(f, ['a', 'b'], chunk_size=2))
+
+    f = io.StringIO('1,2\r\n3,{}\r\n'.format(2**63), newline='')
+    with pytest.raises(ValueError, match=r"Row 2, column 1: duration .* out of int64 range"):
+        list(read_columns(f, [0, 1], header=False))
+
+    f = io.StringIO('a\r\n1 fortnight\r\n', newline='')
+    with pytest.raises(ValueError, match=r"Row 2, column 'a': Cannot decode"):
+        list(read_columns(f, ['a']))
+
+    f = io.StringIO(newline='')
+    with pytest.raises(ValueError, match=r"Row 3, column 'b': row has 1 cells"):
+        write_columns(f, [[1, 2], [3]], ['a', 'b'], header=['a', 'b'])
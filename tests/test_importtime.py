@@ -0,0 +1,23 @@
+from __future__ import absolute_import, division, print_function
+
+import os
+
+import pytest
+
+from benchmarks.importtime import SUPPORTED, import_time, imported_modules
+
+# Cumulative import time budget in microseconds. Override with the
+# BETTERTIMEDELTA_IMPORT_BUDGET_US environment variable on slow machines.
+IMPORT_TIME_BUDGET = int(os.environ.get('BETTERTIMEDELTA_IMPORT_BUDGET_US', 25000))
+
+
+def test_deferred_imports():
+    modules = imported_modules()
+    assert 'bettertimedelta' in modules
+    for name in ['collections', 'decimal', 'itertools', 're', 'represent']:
+        assert name not in modules
+
+
+@pytest.mark.skipif(not SUPPORTED, reason='-X importtime requires Python 3.7+')
+def test_import_time_budget():
+    assert import_time() < IMPORT_TIME_BUDGET
@@ -0,0 +1,87 @@
+# coding: utf-8
+from __future__ import absolute_import, division, print_function
+
+from datetime import timedelta
+
+import pytest
+
+from bettertimedelta import TimeDelta, instrumentation
+
+
+@pytest.fixture
+def counters():
+    instrumentation.enable()
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+
+
+def test_disabled_by_default():
+    assert not instrumentation.is_enabled()
+    TimeDelta(seconds=1)
+    assert instrumentation.snapshot() == {}
+
+
+def test_construction(counters):
+    TimeDelta(seconds=1)
+    TimeDelta(seconds=1.5)
+    TimeDelta(seconds=-1.5)
+    TimeDelta.from_seconds(0.1)
+
+    counts = instrumentation.snapshot()
+    assert counts['construct.integer'] == 1
+    assert counts['construct.ratio'] == 2
+    assert counts['construct.direct'] == 1
+
+
+def test_operations(counters):
+    td = TimeDelta(seconds=1)
+    td + td
+    td + timedelta(seconds=1)
+    td * 2
+    td < td
+    td == 'x'
+    divmod(td, td)
+
+    counts = instrumentation.snapshot()
+    assert counts['op.__add__.TimeDelta'] == 1
+    assert counts['op.__add__.timedelta'] == 1
+    assert counts['op.__mul__.Number'] == 1
+    assert counts['op.__lt__.TimeDelta'] == 1
+    assert counts['op.__eq__.other'] == 1
+    assert counts['op.__divmod__.TimeDelta'] == 1
+    assert 'op.__floordiv__.TimeDelta' not in counts
+    assert 'op.__mod__.TimeDelta' not in counts
+
+
+def test_disable_after_check(monkeypatch):
+    # Another thread may disable counting between the caller's check and
+    # the count.
+    monkeypatch.setattr(instrumentation, 'counters', None)
+    instrumentation.count('construct.integer')
+    instrumentation.count_operation('__add__', 1)
+
+
+def test_format_cache(counters):
+    td = TimeDelta(seconds=1)
+    spec = '%S instrumentation test'
+    format(td, spec)
+    format(td, spec)
+
+    counts = instrumentation.snapshot()
+    assert counts['format.compile'] == 1
+    assert counts['format.cache_hit'] == 1
+
+
+def test_export(counters):
+    exported = []
+    instrumentation.add_export_hook(exported.append)
+    try:
+        TimeDelta(seconds=1)
+        data = instrumentation.export(reset_counts=True)
+    finally:
+        instrumentation.remove_export_hook(exported.append)
+
+    assert exported == [data]
+    assert data['construct.integer'] == 1
+    assert instrumentation.snapshot() == {}
@@ -0,0 +1,133 @@
+from __future__ import absolute_import, division, print_function
+
+import asyncio
+import random
+from datetime import timedelta
+
+import pytest
+
+from bettertimedelta import TimeDelta
+from bettertimedelta.constants import MILLISECOND
+from bettertimedelta.scheduler import TimingWheelScheduler
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_order_and_lateness():
+    async def main():
+        loop = asyncio.get_running_loop()
+        # Small wheel so timers cascade through both levels and overflow.
+        scheduler = TimingWheelScheduler(MILLISECOND, wheel_size=4, levels=2)
+        delays = list(range(0, 60, 3))
+        random.shuffle(delays)
+        fired = []
+        done = loop.create_future()
+        start = loop.time()
+
+        def callback(delay):
+            fired.append((delay, loop.time() - start))
+            if len(fired) == len(delays):
+                done.set_result(None)
+
+        for delay in delays:
+            scheduler.call_later(TimeDelta(milliseconds=delay), callback, delay)
+        assert len(scheduler) == len(delays)
+
+        await asyncio.wait_for(done, 5)
+        assert len(scheduler) == 0
+        return fired
+
+    fired = run(main())
+    assert [delay for delay, _ in fired] == sorted(delay for delay, _ in fired)
+    for delay, elapsed in fired:
+        # asyncio may run call_at handles up to its clock resolution early.
+        assert elapsed >= delay / 1000 - 0.002
+
+
+def test_cancel():
+    async def main():
+        scheduler = TimingWheelScheduler(MILLISECOND, wheel_size=4, levels=2)
+        fired = []
+        handles = [
+            scheduler.call_later(timedelta(milliseconds=i), fired.append, i)
+            for i in range(1, 30)]
+        for handle in handles[::2]:
+            handle.cancel()
+        assert handles[0].cancelled()
+        assert len(scheduler) == 14
+        await asyncio.sleep(0.1)
+        return fired
+
+    assert run(main()) == list(range(2, 30, 2))
+
+
+def test_sleep():
+    async def main():
+        loop = asyncio.get_running_loop()
+        scheduler = TimingWheelScheduler(timedelta(milliseconds=5))
+        start = loop.time()
+        result = await scheduler.sleep(TimeDelta(milliseconds=20), 'done')
+        return result, loop.time() - start
+
+    result, elapsed = run(main())
+    assert result == 'done'
+    assert elapsed >= 0.018
+
+
+def test_close():
+    async def main():
+        scheduler = TimingWheelScheduler()
+        fired = []
+        handle = scheduler.call_later(TimeDelta(milliseconds=5), fired.append, 1)
+        scheduler.close()
+        await asyncio.sleep(0.02)
+        return fired, handle.cancelled(), len(scheduler)
+
+    assert run(main()) == ([], True, 0)
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        TimingWheelScheduler(0)
+
+    async def main():
+        TimingWheelScheduler().call_later(1.5, print)
+
+    with pytest.raises(TypeError):
+        run(main())
+
+
+class FakeHandle(object):
+    def cancel(self):
+        pass
+
+
+class FakeLoop(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def call_at(self, when, callback):
+        return FakeHandle()
+
+
+def test_never_early_fake_clock():
+    for seed in range(300):
+        rng = random.Random(seed)
+        loop = FakeLoop()
+        loop.now = rng.uniform(0, 1000)
+        scheduler = TimingWheelScheduler(rng.choice([1, MILLISECOND]), loop=loop)
+        for _ in range(20):
+            loop.now += rng.uniform(0, 0.01)
+            delay = rng.randint(0, 5000)
+            handle = scheduler.call_later(TimeDelta(microseconds=delay), print)
+            # Allow for float rounding in when(), far below 1 microsecond.
+            assert handle.when() >= loop.now + delay / 1e6 - 1e-9
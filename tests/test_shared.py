@@ -0,0 +1,121 @@
+from __future__ import absolute_import, division, print_function
+
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+from datetime import timedelta
+
+import pytest
+
+from bettertimedelta import TimeDelta
+
+shared = pytest.importorskip('bettertimedelta.shared')
+SharedTimeDeltaArray = shared.SharedTimeDeltaArray
+
+
+@pytest.fixture
+def array():
+    array = SharedTimeDeltaArray.create(4)
+    yield array
+    array.close()
+    array.unlink()
+
+
+def _double(args):
+    array, index = args
+    with array:
+        array[index] = array[index] * 2
+
+
+def test_get_set(array):
+    assert len(array) == 4
+    assert list(array) == [TimeDelta()] * 4
+
+    array[0] = TimeDelta(seconds=1)
+    array[1] = timedelta(days=-1)
+    array[2] = 5
+    array[3] = TimeDelta(weeks=-3, microseconds=1)
+
+    assert array[0] == TimeDelta(seconds=1)
+    assert array[1] == TimeDelta(days=-1)
+    assert array[2] == TimeDelta(microseconds=5)
+    assert array[-1].as_dict() == TimeDelta(weeks=-3, microseconds=1).as_dict()
+    assert array.tolist() == [1000000, -86400000000, 5, -3 * 604800000000 + 1]
+
+    array[1:3] = [TimeDelta(), 7]
+    assert array[1:3] == [TimeDelta(), TimeDelta(microseconds=7)]
+
+    with pytest.raises(TypeError):
+        array[0] = 1.5
+
+
+def test_attach_and_pickle(array):
+    array[0] = TimeDelta(minutes=3)
+
+    with SharedTimeDeltaArray.attach(array.name) as other:
+        assert len(other) == 4
+        assert other[0] == TimeDelta(minutes=3)
+        other[1] = TimeDelta(hours=1)
+    assert array[1] == TimeDelta(hours=1)
+
+    with pickle.loads(pickle.dumps(array)) as other:
+        assert other.name == array.name
+        assert other[0] == TimeDelta(minutes=3)
+
+
+def test_from_iterable():
+    values = [TimeDelta(seconds=i) for i in range(10)]
+    array = SharedTimeDeltaArray.from_iterable(values)
+    try:
+        assert list(array) == values
+    finally:
+        array.close()
+        array.unlink()
+
+
+def test_from_iterable_out_of_range(monkeypatch):
+    def create(*args, **kwargs):
+        raise AssertionError('shared memory created before values were checked')
+
+    monkeypatch.setattr(shared, 'SharedMemory', create)
+    with pytest.raises(OverflowError):
+        SharedTimeDeltaArray.from_iterable([TimeDelta(), 2 ** 63])
+
+
+def test_process_pool():
+    array = SharedTimeDeltaArray.from_iterable(
+        [TimeDelta(seconds=i) for i in range(8)])
+    try:
+        pool = multiprocessing.Pool(2)
+        try:
+            pool.map(_double, [(array, i) for i in range(8)])
+        finally:
+            pool.close()
+            pool.join()
+        assert list(array) == [TimeDelta(seconds=2 * i) for i in range(8)]
+    finally:
+        array.close()
+        array.unlink()
+
+
+def test_attach_from_unrelated_process(array):
+    array[0] = TimeDelta(seconds=42)
+    code = (
+        'from bettertimedelta.shared import SharedTimeDeltaArray\n'
+        'array = SharedTimeDeltaArray.attach({!r})\n'
+        'print(array[0].total_microseconds)\n'
+        'array.close()\n'.format(array.name))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [sys.executable, '-c', code], cwd=root, universal_newlines=True,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = process.communicate()
+    assert process.returncode == 0, stderr
+    assert stdout.strip() == '42000000'
+    assert 'leaked' not in stderr
+
+    # The process exiting mustn't have unlinked the memory.
+    with SharedTimeDeltaArray.attach(array.name) as other:
+        assert other[0] == TimeDelta(seconds=42)
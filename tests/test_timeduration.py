@@ -4,7 +4,9 @@ from __future__ import absolute_import, division, print_function
 import inspect
 import textwrap
 import sys
-from datetime import timedelta
+from datetime import date, datetime, timedelta
+from decimal import ROUND_UP, Decimal, localcontext
+from fractions import Fraction
 from math import isinf
 
 import pytest
@@ -12,7 +14,7 @@ from hypothesis import assume, given
 from hypothesis.strategies import floats, integers
 from IPython.lib.pretty import pretty
 
-from bettertimedelta import TimeDelta
+from bettertimedelta import TimeDelta, shift_datetimes
 
 
 def test_attributes():
@@ -165,6 +167,99 @@ def test_floats(weeks, days, hours, minutes, seconds, milliseconds, microseconds
     td1 = TimeDelta(weeks, days, hours, minutes, seconds, milliseconds, microseconds)
 
 
+@given(integers(-10**20, 10**20))
+def test_integer_path_matches_decimal(microseconds):
+    td1 = TimeDelta(microseconds=microseconds)
+    td2 = TimeDelta(microseconds=Decimal(microseconds))
+    assert td1.as_dict() == td2.as_dict()
+    assert td1.total_microseconds == td2.total_microseconds
+
+
+def test_decimal_context_independent():
+    values = [0.1, -1.5, '-1.0000000000000000000000000000005', Decimal('2.5e-40')]
+    expected = [TimeDelta(seconds=value) for value in values]
+
+    with localcontext() as ctx:
+        ctx.prec = 3
+        ctx.rounding = ROUND_UP
+        for value, td in zip(values, expected):
+            assert TimeDelta(seconds=value).as_dict() == td.as_dict()
+
+    assert TimeDelta(seconds='-1.0000000000000000000000000000005') == TimeDelta(seconds=-1)
+    assert TimeDelta(microseconds=-1e-60).as_dict() == TimeDelta().as_dict()
+    assert TimeDelta(weeks=10**40, microseconds=-0.5).total_microseconds == 10**40 * 604800000000
+
+
+def test_tiny_decimal_exponent():
+    # Would build a ten million digit denominator if converted exactly.
+    assert TimeDelta(seconds='1e-10000000', minutes=0.5) == TimeDelta(seconds=30)
+    assert TimeDelta(seconds='0e-10000000') == TimeDelta()
+
+    # Only decides ties, in the same direction as the exact value.
+    assert TimeDelta(microseconds=0.5, seconds='1e-10000000').total_microseconds == 1
+    assert TimeDelta(microseconds=1.5, weeks='-1e-10000000').total_microseconds == 1
+    assert TimeDelta(microseconds=2.5, seconds=Decimal('1e-10000000')).total_microseconds == 3
+    assert TimeDelta(microseconds=0.5, milliseconds=5e-324, seconds='-1e-1200').total_microseconds == 1
+
+
+@given(floats(-1e9, 1e9))
+def test_from_seconds(seconds):
+    td1 = TimeDelta.from_seconds(seconds)
+    td2 = TimeDelta(seconds=seconds)
+    assert td1.as_dict() == td2.as_dict()
+    assert td1.total_microseconds == td2.total_microseconds
+
+
+@given(floats(-1e15, 1e15))
+def test_from_microseconds(microseconds):
+    td1 = TimeDelta.from_microseconds(microseconds)
+    td2 = TimeDelta(microseconds=microseconds)
+    assert td1.as_dict() == td2.as_dict()
+    assert td1.total_microseconds == td2.total_microseconds
+
+
+@given(integers(-10**20, 10**20))
+def test_from_nanoseconds(nanoseconds):
+    td1 = TimeDelta.from_nanoseconds(nanoseconds)
+    td2 = TimeDelta(microseconds=Fraction(nanoseconds, 1000))
+    assert td1.as_dict() == td2.as_dict()
+    assert td1.total_microseconds == td2.total_microseconds
+
+
+def test_alternate_constructors():
+    assert TimeDelta.from_seconds(0.1) == TimeDelta(milliseconds=100)
+    assert TimeDelta.from_seconds(2) == TimeDelta(seconds=2)
+    assert TimeDelta.from_seconds(Fraction(1, 3)) == TimeDelta(microseconds=333333)
+    assert TimeDelta.from_seconds(Decimal('1.5')) == TimeDelta(seconds=1.5)
+
+    # Rounding is half to even
+    assert TimeDelta.from_nanoseconds(1500) == TimeDelta(microseconds=2)
+    assert TimeDelta.from_nanoseconds(2500) == TimeDelta(microseconds=2)
+    assert TimeDelta.from_nanoseconds(-1500) == TimeDelta(microseconds=-2)
+    assert TimeDelta.from_microseconds(0.5) == TimeDelta()
+
+    assert TimeDelta.from_perf_counter_delta(1.0, 3.5) == TimeDelta(seconds=2.5)
+    assert TimeDelta.from_perf_counter_delta(1000, 3000) == TimeDelta(microseconds=2)
+    with pytest.raises(TypeError):
+        TimeDelta.from_perf_counter_delta(1000, 3.5)
+    with pytest.raises(TypeError):
+        TimeDelta.from_perf_counter_delta(1.0, 3000)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='time.perf_counter_ns requires Python 3.7+')
+def test_perf_counter_delta_now():
+    assert TimeDelta.from_perf_counter_delta(0.0) > TimeDelta()
+    assert TimeDelta.from_perf_counter_delta(0) > TimeDelta()
+
+
+def test_perf_counter_delta_unavailable(monkeypatch):
+    import time
+    monkeypatch.delattr(time, 'perf_counter_ns', raising=False)
+    with pytest.raises(RuntimeError):
+        TimeDelta.from_perf_counter_delta(0)
+    assert TimeDelta.from_perf_counter_delta(1000, 3000) == TimeDelta(microseconds=2)
+
+
 def test_ordering():
     td1 = TimeDelta(weeks=1, days=6, hours=23, minutes=59, seconds=59, milliseconds=999, microseconds=999)
     td2 = TimeDelta(weeks=2)
@@ -209,6 +304,39 @@ def test_operations():
     assert divmod(TimeDelta(weeks=1, days=3), TimeDelta(weeks=1)) == (1, TimeDelta(days=3))
 
 
+def test_mixed_operands():
+    class TimeDeltaSubclass(timedelta):
+        pass
+
+    td = TimeDelta(days=1, microseconds=5)
+    sub = TimeDeltaSubclass(days=1)
+    assert td > sub
+    assert td - sub == TimeDelta(microseconds=5)
+    assert sub + td == TimeDelta(days=2, microseconds=5)
+    assert td % sub == TimeDelta(microseconds=5)
+    assert td / timedelta(microseconds=5) == 17280000001
+    assert td.__lt__('x') is NotImplemented
+    assert td.__add__(1.5) is NotImplemented
+
+    from bettertimedelta.utils import _duration_converters
+    assert TimeDeltaSubclass in _duration_converters
+    assert float not in _duration_converters
+    assert str not in _duration_converters
+
+    assert td.as_timedelta() is td.as_timedelta()
+    assert datetime(2016, 1, 1) + td == datetime(2016, 1, 2, 0, 0, 0, 5)
+    assert date(2016, 1, 1) - TimeDelta(days=1) == date(2015, 12, 31)
+
+
+def test_shift_datetimes():
+    datetimes = [datetime(2016, 1, d) for d in range(1, 4)]
+    expected = [datetime(2016, 1, d, 1) for d in range(1, 4)]
+    assert shift_datetimes(datetimes, TimeDelta(hours=1)) == expected
+    assert shift_datetimes(iter(datetimes), timedelta(hours=1)) == expected
+    assert TimeDelta(hours=1).apply_to(datetimes) == expected
+    assert TimeDelta(days=-1).apply_to([date(2016, 1, 1)]) == [date(2015, 12, 31)]
+
+
 def test_timedelta_tests():
     """These test cases are taken from CPython's Lib/test/datetimetester.py"""
 